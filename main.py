@@ -170,25 +170,24 @@ async def interactive_mode(model: str, agent_name: str, working_dir: str, userna
     # 渐变色欢迎文字
     print_welcome_message(username)
     
-    # 显示加载步骤
-    show_loading_step("Loading configuration...", "dots2", 0.3)
-    
     # 设置日志目录（在工作目录下）
     log_dir = Path(working_dir) / ".mico" / "logs"
-    set_log_dir(log_dir)
+    await show_loading_step("Setting up logger...", asyncio.to_thread(set_log_dir, log_dir), "dots3")
     logger = get_logger()
-    
-    show_loading_step("Setting up logger...", "dots3", 0.2)
 
     # 初始化组件
-    show_loading_step("Initializing components...", "line", 0.2)
-    session_manager = SessionManager()
-    agent_manager = AgentManager(working_dir)
-    tool_registry = create_default_registry()
+    session_manager, agent_manager, tool_registry = await show_loading_step(
+        "Initializing components...",
+        asyncio.to_thread(lambda: (SessionManager(), AgentManager(working_dir), create_default_registry())),
+        "line"
+    )
 
     # 创建会话
-    show_loading_step("Creating session...", "star", 0.2)
-    session = session_manager.create(agent=agent_name, model=model)
+    session = await show_loading_step(
+        "Creating session...",
+        asyncio.to_thread(session_manager.create, agent=agent_name, model=model),
+        "star"
+    )
 
     # 记录会话开始
     logger.session_start(
@@ -134,7 +134,7 @@ class AgentLoop:
                 if self._detect_doom_loop():
                     console.print("[yellow]⚠ Doom loop detected![/yellow]")
                     try:
-                        await self.permission.check("doom_loop", ["*"])
+                        self.permission.check("doom_loop", ["*"])
                     except PermissionRejectedError:
                         assistant_msg.finish_reason = "stopped"
                         return assistant_msg
@@ -195,6 +195,7 @@ class AgentLoop:
         # 调用 LLM
         current_text = ""
         tool_calls: dict[str, ToolCall] = {}
+        tool_args: dict[str, str] = {}  # 累积的工具参数 JSON 字符串
         edit_previewers: dict[str, EditStreamPreview] = {}
         finish_reason = "stop"
         preparing_questions_status = None
@@ -246,20 +247,18 @@ class AgentLoop:
 
                 elif chunk.type == "tool_call_delta":
                     if chunk.tool_call_id in tool_calls:
-                        tc = tool_calls[chunk.tool_call_id]
                         # 累积参数字符串
-                        if not hasattr(tc, "_args_str"):
-                            tc._args_str = ""
-                        tc._args_str += chunk.tool_args_delta or ""
+                        args_str = tool_args.get(chunk.tool_call_id, "") + (chunk.tool_args_delta or "")
+                        tool_args[chunk.tool_call_id] = args_str
 
                         # 如果是 edit 工具，进行流式预览
                         if chunk.tool_call_id in edit_previewers:
                             previewer = edit_previewers[chunk.tool_call_id]
                             # 尝试提取 file_path
-                            if previewer.file_path == "unknown" and '"file_path"' in tc._args_str:
+                            if previewer.file_path == "unknown" and '"file_path"' in args_str:
                                 try:
                                     import re
-                                    match = re.search(r'"file_path"\s*:\s*"([^"]+)"', tc._args_str)
+                                    match = re.search(r'"file_path"\s*:\s*"([^"]+)"', args_str)
                                     if match:
                                         previewer.file_path = match.group(1)
                                 except:
@@ -334,14 +333,14 @@ class AgentLoop:
 
         # 处理工具调用
         if tool_calls:
-            for tc in tool_calls.values():
+            for call_id, tc in tool_calls.items():
                 # 解析参数
-                if hasattr(tc, "_args_str"):
+                args_str = tool_args.get(call_id)
+                if args_str is not None:
                     try:
-                        tc.input = json.loads(tc._args_str)
+                        tc.input = json.loads(args_str)
                     except:
-                        tc.input = {"raw": tc._args_str}
-                    delattr(tc, "_args_str")
+                        tc.input = {"raw": args_str}
 
                 # 添加到消息
                 add_tool_part(assistant_msg, tc)
@@ -437,7 +436,7 @@ class AgentLoop:
                         precheck_patterns = [pattern]
 
                 if precheck_patterns:
-                    await self.permission.check(tc.tool_name, precheck_patterns, tc.input)
+                    self.permission.check(tc.tool_name, precheck_patterns, tc.input)
                     ctx.preapprove(tc.tool_name, precheck_patterns)
 
                 # ask_user 需要占用终端输入，避免 Status 刷新干扰
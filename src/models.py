@@ -3,10 +3,11 @@
 """
 
 from __future__ import annotations
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from enum import Enum
 from typing import Any, Literal, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 import ulid
 import secrets
 import string
@@ -41,9 +42,13 @@ class ToolState(str, Enum):
     ERROR = "error"
 
 
-class ToolCall(BaseModel):
+# ToolCall 与各 Part 在流式输出中高频构造，使用 slots dataclass 以避免校验开销；
+# UserMessage / AssistantMessage / Session 仍为 pydantic 模型，作为序列化边界
+
+@dataclass(slots=True, kw_only=True)
+class ToolCall:
     """工具调用记录"""
-    id: str = Field(default_factory=lambda: generate_id("call"))
+    id: str = field(default_factory=lambda: generate_id("call"))
     tool_name: str
     input: dict[str, Any]
     state: ToolState = ToolState.PENDING
@@ -52,27 +57,66 @@ class ToolCall(BaseModel):
     start_time: Optional[datetime] = None
     end_time: Optional[datetime] = None
 
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ToolCall:
+        data = dict(data)
+        data["state"] = ToolState(data.get("state", ToolState.PENDING))
+        for key in ("start_time", "end_time"):
+            if isinstance(data.get(key), str):
+                data[key] = datetime.fromisoformat(data[key])
+        return cls(**data)
+
 
 # ============ Message Models ============
 
-class TextPart(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class TextPart:
     """文本部分"""
     type: Literal["text"] = "text"
     text: str
     synthetic: bool = False  # 是否为系统生成
 
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> TextPart:
+        return cls(**data)
 
-class ToolPart(BaseModel):
+
+@dataclass(slots=True, kw_only=True)
+class ToolPart:
     """工具调用部分"""
     type: Literal["tool"] = "tool"
     tool_call: ToolCall
 
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ToolPart:
+        tool_call = data["tool_call"]
+        if isinstance(tool_call, dict):
+            tool_call = ToolCall.from_dict(tool_call)
+        return cls(type=data.get("type", "tool"), tool_call=tool_call)
+
 
-class ReasoningPart(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class ReasoningPart:
     """思维链部分"""
     type: Literal["reasoning"] = "reasoning"
     text: str
 
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ReasoningPart:
+        return cls(**data)
+
 
 MessagePart = TextPart | ToolPart | ReasoningPart
 
@@ -149,18 +193,38 @@ class Session(BaseModel):
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
 
+    # 最近一条用户/助手消息的缓存，避免每次反向遍历
+    _last_user: Optional[UserMessage] = PrivateAttr(default=None)
+    _last_assistant: Optional[AssistantMessage] = PrivateAttr(default=None)
+    _last_indexed: bool = PrivateAttr(default=False)
+
     def add_message(self, message: Message):
         self.messages.append(message)
+        if message.role == "user":
+            self._last_user = message
+        elif message.role == "assistant":
+            self._last_assistant = message
         self.updated_at = datetime.now()
 
-    def get_last_user_message(self) -> Optional[UserMessage]:
+    def _index_last_messages(self):
+        """从磁盘加载的历史只需反向扫描一次"""
+        if self._last_indexed:
+            return
+        self._last_user = None
+        self._last_assistant = None
         for msg in reversed(self.messages):
-            if msg.role == "user":
-                return msg
-        return None
+            if msg.role == "user" and self._last_user is None:
+                self._last_user = msg
+            elif msg.role == "assistant" and self._last_assistant is None:
+                self._last_assistant = msg
+            if self._last_user is not None and self._last_assistant is not None:
+                break
+        self._last_indexed = True
+
+    def get_last_user_message(self) -> Optional[UserMessage]:
+        self._index_last_messages()
+        return self._last_user
 
     def get_last_assistant_message(self) -> Optional[AssistantMessage]:
-        for msg in reversed(self.messages):
-            if msg.role == "assistant":
-                return msg
-        return None
+        self._index_last_messages()
+        return self._last_assistant
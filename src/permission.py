@@ -34,6 +34,32 @@ class PermissionManager:
         self.rules = rules or []
         self.approved: list[PermissionRule] = []  # 运行时批准的规则
         self.ask_callback = ask_callback or self._default_ask
+        # 按匹配优先级倒序排列的规则（运行时批准的在最前）
+        self._rev_rules: list[PermissionRule] = []
+        # 规则摘要：用于跳过 evaluate 的快速路径
+        self._has_universal_allow = False
+        self._sensitive_perms: set[str] = set()
+        self._rebuild_cache()
+
+    def _rebuild_cache(self):
+        """
+        规则变更后重建缓存
+
+        当存在 "* *" 的 ALLOW 规则，且所有非 ALLOW 规则的权限名都是字面量时，
+        不在 _sensitive_perms 中的权限必然评估为 ALLOW。
+        """
+        self._rev_rules = list(reversed(self.rules + self.approved))
+
+        sensitive = {r.permission for r in self.rules if r.action is not PermissionAction.ALLOW}
+        has_allow = any(
+            r.permission == "*" and r.pattern == "*" and r.action is PermissionAction.ALLOW
+            for r in self.rules
+        )
+        # 通配的敏感权限无法用集合判断，此时关闭快速路径
+        if any(_has_wildcard(p) for p in sensitive):
+            has_allow = False
+        self._has_universal_allow = has_allow
+        self._sensitive_perms = sensitive
 
     def _default_ask(self, permission: str, pattern: str, metadata: dict) -> bool:
         """默认的询问用户函数"""
@@ -52,11 +78,13 @@ class PermissionManager:
 
         if response == "always":
             # 记住这个决定
-            self.approved.append(PermissionRule(
+            rule = PermissionRule(
                 permission=permission,
                 pattern=pattern,
                 action=PermissionAction.ALLOW
-            ))
+            )
+            self.approved.append(rule)
+            self._rev_rules.insert(0, rule)
             return True
         return response == "y"
 
@@ -68,11 +96,8 @@ class PermissionManager:
         1. 运行时批准的规则
         2. 配置的规则（后面的优先）
         """
-        # 合并规则，运行时批准的优先级最高
-        all_rules = self.rules + self.approved
-
-        # 从后往前查找匹配的规则（后定义的优先）
-        for rule in reversed(all_rules):
+        # 运行时批准的优先级最高，其次后定义的优先（_rev_rules 已倒序）
+        for rule in self._rev_rules:
             if self._match(permission, rule.permission) and self._match(pattern, rule.pattern):
                 return rule.action
 
@@ -85,7 +110,7 @@ class PermissionManager:
             return True
         return fnmatch.fnmatch(value, pattern)
 
-    async def check(
+    def check(
         self,
         permission: str,
         patterns: list[str],
@@ -101,15 +126,19 @@ class PermissionManager:
             metadata: 额外信息，用于显示给用户
             always_patterns: 用户选择"always"时记住的模式
         """
+        # 快速路径：该权限不受任何非 ALLOW 规则约束
+        if self._has_universal_allow and permission not in self._sensitive_perms:
+            return
+
         for pattern in patterns:
             action = self.evaluate(permission, pattern)
 
-            if action == PermissionAction.DENY:
+            if action is PermissionAction.DENY:
                 raise PermissionDeniedError(
                     f"Permission '{permission}' denied for pattern '{pattern}'"
                 )
 
-            if action == PermissionAction.ASK:
+            if action is PermissionAction.ASK:
                 allowed = self.ask_callback(permission, pattern, metadata or {})
                 if not allowed:
                     raise PermissionRejectedError(
@@ -119,10 +148,17 @@ class PermissionManager:
     def add_rule(self, rule: PermissionRule):
         """添加规则"""
         self.rules.append(rule)
+        self._rebuild_cache()
 
     def merge_rules(self, rules: list[PermissionRule]):
         """合并规则"""
         self.rules.extend(rules)
+        self._rebuild_cache()
+
+
+def _has_wildcard(pattern: str) -> bool:
+    """判断模式中是否包含通配符"""
+    return any(c in pattern for c in "*?[")
 
 
 # ============ 默认权限规则 ============
@@ -14,6 +14,9 @@ from .models import (
     generate_id
 )
 
+# 工具调用的终止状态
+_TERMINAL_TOOL_STATES = frozenset({ToolState.COMPLETED, ToolState.ERROR})
+
 
 class SessionManager:
     """会话管理器"""
@@ -169,9 +172,9 @@ def update_tool_part(
             part.tool_call.state = state
             part.tool_call.output = output
             part.tool_call.error = error
-            if state == ToolState.RUNNING:
+            if state is ToolState.RUNNING:
                 part.tool_call.start_time = datetime.now()
-            elif state in (ToolState.COMPLETED, ToolState.ERROR):
+            elif state in _TERMINAL_TOOL_STATES:
                 part.tool_call.end_time = datetime.now()
             return
 
@@ -227,7 +230,7 @@ def messages_to_openai_format(messages: list[Message]) -> list[dict]:
             for part in msg.parts:
                 if isinstance(part, ToolPart):
                     tc = part.tool_call
-                    if tc.state in (ToolState.COMPLETED, ToolState.ERROR):
+                    if tc.state in _TERMINAL_TOOL_STATES:
                         result.append({
                             "role": "tool",
                             "tool_call_id": tc.id,
@@ -3,11 +3,12 @@
 """
 
 from __future__ import annotations
-import json
+import orjson
 from typing import Any
 from rich.prompt import Prompt
 
 from .base import BaseTool, ToolContext, ToolResult
+from ..ui.console import console
 
 
 class AskUserTool(BaseTool):
@@ -67,8 +68,6 @@ class AskUserTool(BaseTool):
             )
 
         if title:
-            from rich.console import Console
-            console = Console()
             console.print(f"\n[bold cyan]🧩 {title}[/bold cyan]")
 
         answers = []
@@ -86,12 +85,10 @@ class AskUserTool(BaseTool):
                 })
                 continue
 
-            # 显示题目
-            from rich.console import Console
-            console = Console()
-            console.print(f"\n[bold]Q{idx}.[/bold] {question_text}")
-            for opt_idx, opt in enumerate(options, start=1):
-                console.print(f"  [dim]{opt_idx}.[/dim] {opt}")
+            # 显示题目（题干和选项一次输出）
+            block = [f"\n[bold]Q{idx}.[/bold] {question_text}"]
+            block.extend(f"  [dim]{opt_idx}.[/dim] {opt}" for opt_idx, opt in enumerate(options, start=1))
+            console.print("\n".join(block))
 
             if q_type == "multi":
                 # 多选：输入逗号分隔的编号
@@ -139,7 +136,7 @@ class AskUserTool(BaseTool):
         }
 
         return ToolResult(
-            output=json.dumps(result, ensure_ascii=False),
+            output=orjson.dumps(result).decode(),
             title=title or "ask_user_result",
             metadata={"count": len(answers)}
         )
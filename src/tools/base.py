@@ -4,6 +4,7 @@
 
 from __future__ import annotations
 from abc import ABC, abstractmethod
+from functools import cached_property
 from pathlib import Path
 from typing import Any, Optional, TYPE_CHECKING
 from pydantic import BaseModel
@@ -52,7 +53,7 @@ class ToolContext:
             if not remaining:
                 return
             patterns = remaining
-        await self.permission.check(permission, patterns, metadata)
+        self.permission.check(permission, patterns, metadata)
 
 
 class ToolResult(BaseModel):
@@ -79,6 +80,11 @@ class BaseTool(ABC):
         """执行工具"""
         pass
 
+    @cached_property
+    def parameters_schema(self) -> dict:
+        """参数 JSON Schema（为常量，只构建一次）"""
+        return self.get_parameters_schema()
+
     def to_openai_tool(self) -> dict:
         """转换为 OpenAI 工具格式"""
         return {
@@ -86,7 +92,7 @@ class BaseTool(ABC):
             "function": {
                 "name": self.name,
                 "description": self.description,
-                "parameters": self.get_parameters_schema()
+                "parameters": self.parameters_schema
             }
         }
 
@@ -96,10 +102,12 @@ class ToolRegistry:
 
     def __init__(self):
         self._tools: dict[str, BaseTool] = {}
+        self._openai_tools_cache: Optional[list[dict]] = None
 
     def register(self, tool: BaseTool):
         """注册工具"""
         self._tools[tool.name] = tool
+        self._openai_tools_cache = None
 
     def get(self, name: str) -> Optional[BaseTool]:
         """获取工具"""
@@ -110,5 +118,7 @@ class ToolRegistry:
         return list(self._tools.values())
 
     def to_openai_tools(self) -> list[dict]:
-        """转换为 OpenAI 工具列表"""
-        return [tool.to_openai_tool() for tool in self._tools.values()]
+        """转换为 OpenAI 工具列表（结果会被缓存，调用方不应修改）"""
+        if self._openai_tools_cache is None:
+            self._openai_tools_cache = [tool.to_openai_tool() for tool in self._tools.values()]
+        return self._openai_tools_cache
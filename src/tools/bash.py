@@ -3,8 +3,44 @@ Bash 命令执行工具
 """
 
 import asyncio
+import os
 from .base import BaseTool, ToolContext, ToolResult
 
+# 输出上限（stdout + stderr），超出后终止进程
+OUTPUT_CAP = 1_048_576
+# 每次从管道读取的字节数
+READ_CHUNK_SIZE = 65536
+# 超限时保留的 stderr 末尾字节数（通常包含出错原因）
+STDERR_TAIL = 4096
+
+
+def _kill(process: asyncio.subprocess.Process) -> None:
+    """终止 shell 进程（已退出时忽略）"""
+    try:
+        process.kill()
+    except ProcessLookupError:
+        pass
+
+
+async def _open_pipe() -> tuple[asyncio.StreamReader, asyncio.ReadTransport, int]:
+    """
+    创建管道，返回 (读端 StreamReader, 读端 transport, 写端 fd)
+
+    读端由本进程持有，超限时可直接关闭，仍在写入的子进程会因 SIGPIPE 退出。
+    """
+    read_fd, write_fd = os.pipe()
+    read_file = os.fdopen(read_fd, "rb", buffering=0)
+    reader = asyncio.StreamReader()
+    try:
+        transport, _ = await asyncio.get_running_loop().connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader), read_file
+        )
+    except BaseException:
+        read_file.close()
+        os.close(write_fd)
+        raise
+    return reader, transport, write_fd
+
 
 class BashTool(BaseTool):
     """Bash 命令执行工具"""
@@ -40,29 +76,87 @@ The command runs in the current working directory."""
         # 检查权限
         await ctx.ask_permission("bash", [command], {"command": command})
 
+        transports = []
         try:
-            # 异步执行命令
-            process = await asyncio.create_subprocess_shell(
-                command,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=str(ctx.working_dir)
-            )
+            # 自己创建 stdout/stderr 管道，超限时可关闭读端
+            out_reader, out_transport, out_w = await _open_pipe()
+            transports.append(out_transport)
+            try:
+                err_reader, err_transport, err_w = await _open_pipe()
+            except BaseException:
+                os.close(out_w)
+                raise
+            transports.append(err_transport)
+
+            try:
+                # 异步执行命令
+                process = await asyncio.create_subprocess_shell(
+                    command,
+                    stdout=out_w,
+                    stderr=err_w,
+                    cwd=str(ctx.working_dir)
+                )
+            finally:
+                # 写端已由子进程继承，关闭父进程的副本，子进程退出后读端才能读到 EOF
+                os.close(out_w)
+                os.close(err_w)
+
+            stdout = bytearray()
+            stderr = bytearray()
+            overflow = False
+
+            async def pump(stream: asyncio.StreamReader, buf: bytearray):
+                """流式读取管道，超出上限时终止进程并关闭管道"""
+                nonlocal overflow
+                while not overflow:
+                    chunk = await stream.read(READ_CHUNK_SIZE)
+                    if not chunk:
+                        return
+                    buf.extend(chunk)
+                    if len(stdout) + len(stderr) > OUTPUT_CAP:
+                        overflow = True
+                        _kill(process)
+                        # shell 派生的子进程可能仍持有管道，关闭读端而不是读到 EOF
+                        for transport in transports:
+                            transport.close()
 
             try:
-                stdout, stderr = await asyncio.wait_for(
-                    process.communicate(),
+                await asyncio.wait_for(
+                    asyncio.gather(
+                        pump(out_reader, stdout),
+                        pump(err_reader, stderr),
+                        process.wait()
+                    ),
                     timeout=self.timeout
                 )
+            except asyncio.CancelledError:
+                _kill(process)
+                raise
             except asyncio.TimeoutError:
-                process.kill()
+                _kill(process)
                 return ToolResult(
                     output=f"Command timed out after {self.timeout}s",
                     title=description,
                     error="timeout"
                 )
 
-            output = stdout.decode() + stderr.decode()
+            if overflow:
+                # stdout 单独截断，保留 stderr 末尾
+                err_tail = stderr[-STDERR_TAIL:]
+                out_head = stdout[:OUTPUT_CAP - len(err_tail)]
+                output = (
+                    out_head.decode("utf-8", errors="replace")
+                    + err_tail.decode("utf-8", errors="replace")
+                )
+                return ToolResult(
+                    output=output + f"\n... (output exceeded {OUTPUT_CAP} bytes, process killed)",
+                    title=description,
+                    metadata={"exit_code": process.returncode},
+                    error="output_too_large"
+                )
+
+            stdout.extend(stderr)
+            output = stdout.decode("utf-8", errors="replace")
             return ToolResult(
                 output=output,
                 title=description,
@@ -75,3 +169,6 @@ The command runs in the current working directory."""
                 title=description,
                 error=str(e)
             )
+        finally:
+            for transport in transports:
+                transport.close()
@@ -2,11 +2,98 @@
 编辑文件工具
 """
 
+import asyncio
 import os
+import stat
 from pathlib import Path
 from .base import BaseTool, ToolContext, ToolResult
 
 
+def _write_bytes(file_path: Path, data: bytes) -> None:
+    """
+    原子写入：先写临时文件再 os.replace，中途失败不会留下残缺文件
+
+    直接用 os.write 写入，绕过 BufferedWriter 的 8 KiB 分块；不做 fsync。
+    """
+    # 写穿符号链接，保持链接本身不变
+    target = Path(os.path.realpath(file_path))
+    tmp_path = target.with_name(f"{target.name}.tmp{os.getpid()}")
+    try:
+        mode = stat.S_IMODE(os.stat(target).st_mode)
+    except FileNotFoundError:
+        mode = None
+
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        try:
+            if mode is not None:
+                # 保留原文件权限（如可执行位）
+                os.fchmod(fd, mode)
+            view = memoryview(data)
+            while view:
+                # os.write 可能只写入部分数据
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, target)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _edit_sync(file_path: Path, old_string: str, new_string: str) -> ToolResult:
+    """同步执行创建/替换（在线程中运行，避免阻塞事件循环）"""
+    try:
+        # 创建新文件
+        if old_string == "":
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            _write_bytes(file_path, new_string.encode("utf-8"))
+            return ToolResult(
+                output=f"Created file: {file_path}",
+                title=str(file_path),
+                metadata={"operation": "create"}
+            )
+
+        # 编辑现有文件：在字节上查找（bytes.find 为 C 实现），UTF-8 自同步保证匹配落在字符边界
+        data = file_path.read_bytes()
+        data.decode("utf-8")  # 仅校验编码，非 UTF-8 文件照旧报错
+        if b"\r" in data:
+            # 与文本模式一致：先统一换行符再匹配、计数（写回时为 \n）
+            data = data.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+        old_b = old_string.encode("utf-8")
+        idx = data.find(old_b)
+
+        if idx == -1:
+            return ToolResult(
+                output=f"old_string not found in {file_path}",
+                error="not_found"
+            )
+
+        # 检查是否有多个匹配（不重叠，与 str.count 一致）
+        if data.find(old_b, idx + len(old_b)) != -1:
+            # 仅在出错时统计总匹配数
+            count = data.count(old_b)
+            return ToolResult(
+                output=f"Found {count} matches. Provide more context in old_string to identify a unique match.",
+                error="multiple_matches"
+            )
+
+        # 执行替换
+        _write_bytes(file_path, data[:idx] + new_string.encode("utf-8") + data[idx + len(old_b):])
+
+        return ToolResult(
+            output="Edit applied successfully.",
+            title=str(file_path),
+            metadata={"operation": "edit"}
+        )
+
+    except Exception as e:
+        return ToolResult(output=str(e), error=str(e))
+
+
 class EditTool(BaseTool):
     """编辑文件工具"""
 
@@ -52,46 +139,5 @@ If the file doesn't exist and old_string is empty, a new file will be created.""
             "operation": "create" if old_string == "" else "edit"
         })
 
-        try:
-            # 创建新文件
-            if old_string == "":
-                file_path.parent.mkdir(parents=True, exist_ok=True)
-                with open(file_path, "w", encoding="utf-8") as f:
-                    f.write(new_string)
-                return ToolResult(
-                    output=f"Created file: {file_path}",
-                    title=str(file_path),
-                    metadata={"operation": "create"}
-                )
-
-            # 编辑现有文件
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-
-            if old_string not in content:
-                return ToolResult(
-                    output=f"old_string not found in {file_path}",
-                    error="not_found"
-                )
-
-            # 检查是否有多个匹配
-            count = content.count(old_string)
-            if count > 1:
-                return ToolResult(
-                    output=f"Found {count} matches. Provide more context in old_string to identify a unique match.",
-                    error="multiple_matches"
-                )
-
-            # 执行替换
-            new_content = content.replace(old_string, new_string, 1)
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(new_content)
-
-            return ToolResult(
-                output="Edit applied successfully.",
-                title=str(file_path),
-                metadata={"operation": "edit"}
-            )
-
-        except Exception as e:
-            return ToolResult(output=str(e), error=str(e))
+        # 文件 I/O 放到线程中执行，权限询问仍在事件循环上
+        return await asyncio.to_thread(_edit_sync, file_path, old_string, new_string)
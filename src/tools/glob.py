@@ -2,8 +2,24 @@
 文件搜索工具
 """
 
+import asyncio
+import os
+from pathlib import Path
 from .base import BaseTool, ToolContext, ToolResult
 
+# 最多返回的结果数
+MAX_RESULTS = 100
+
+
+def _glob_sync(root: Path, pattern: str, limit: int) -> tuple[list[Path], bool]:
+    """惰性遍历匹配结果，多取一个用于判断是否截断"""
+    matches = []
+    for path in root.glob(pattern):
+        if len(matches) >= limit:
+            return matches, True
+        matches.append(path)
+    return matches, False
+
 
 class GlobTool(BaseTool):
     """文件搜索工具"""
@@ -28,19 +44,28 @@ Use this to discover files in the project."""
         pattern = params["pattern"]
 
         try:
-            matches = list(ctx.working_dir.glob(pattern))
-            # 限制结果数量
-            max_results = 100
-            truncated = len(matches) > max_results
+            # 限制结果数量，达到上限后立即停止遍历
+            matches, truncated = await asyncio.to_thread(
+                _glob_sync, ctx.working_dir, pattern, MAX_RESULTS
+            )
 
-            output_lines = [str(p.relative_to(ctx.working_dir)) for p in matches[:max_results]]
+            # working_dir 总是结果的前缀，直接切片字符串，避免逐个 relative_to
+            prefix = os.path.join(str(ctx.working_dir), "")
+            prefix_len = len(prefix)
+            output_lines = []
+            for p in matches:
+                s = str(p)
+                output_lines.append(s[prefix_len:] if s.startswith(prefix) else s)
             if truncated:
-                output_lines.append(f"... and {len(matches) - max_results} more files")
+                output_lines.append(f"... more than {MAX_RESULTS} files, results truncated")
 
             return ToolResult(
                 output="\n".join(output_lines) if output_lines else "No files found",
                 title=f"glob: {pattern}",
-                metadata={"count": len(matches), "truncated": truncated}
+                metadata={
+                    "count": f">{MAX_RESULTS}" if truncated else len(matches),
+                    "truncated": truncated
+                }
             )
         except Exception as e:
             return ToolResult(output=str(e), error=str(e))
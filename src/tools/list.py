@@ -2,11 +2,30 @@
 列出目录工具
 """
 
+import asyncio
+import operator
 import os
 from pathlib import Path
 from .base import BaseTool, ToolContext, ToolResult
 
 
+def _list_sync(path: Path) -> list[str]:
+    """使用 scandir 列出目录，DirEntry 自带类型信息，无需逐项 stat"""
+    dirs = []
+    files = []
+    with os.scandir(path) as it:
+        for entry in sorted(it, key=operator.attrgetter("name")):
+            if entry.name.startswith("."):
+                continue  # 跳过隐藏文件
+            if entry.is_dir():
+                dirs.append(f"📁 {entry.name}")
+            else:
+                files.append(f"📄 {entry.name}")
+
+    # 目录在前，文件在后
+    return dirs + files
+
+
 class ListTool(BaseTool):
     """列出目录内容"""
 
@@ -34,18 +53,7 @@ Similar to 'ls -la' but formatted for AI consumption."""
             path = Path(path)
 
         try:
-            dirs = []
-            files = []
-            for entry in sorted(path.iterdir()):
-                if entry.name.startswith("."):
-                    continue  # 跳过隐藏文件
-                if entry.is_dir():
-                    dirs.append(f"📁 {entry.name}")
-                else:
-                    files.append(f"📄 {entry.name}")
-            
-            # 目录在前，文件在后
-            entries = dirs + files
+            entries = await asyncio.to_thread(_list_sync, path)
 
             return ToolResult(
                 output="\n".join(entries) if entries else "Empty directory",
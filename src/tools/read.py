@@ -2,11 +2,20 @@
 读取文件工具
 """
 
+import asyncio
 import os
+from itertools import islice
 from pathlib import Path
+from typing import Optional
 from .base import BaseTool, ToolContext, ToolResult
 
 
+def _read_lines_sync(file_path: Path, start: int, end: Optional[int]) -> list[str]:
+    """只读取 [start, end) 范围内的行，不把整个文件载入内存"""
+    with open(file_path, "r", encoding="utf-8") as f:
+        return list(islice(f, start, end))
+
+
 class ReadTool(BaseTool):
     """读取文件工具"""
 
@@ -49,13 +58,10 @@ Use this to examine code, configuration, or any text file."""
         await ctx.ask_permission("read", [str(file_path)])
 
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                lines = f.readlines()
-
             # 应用 offset 和 limit
             start = max(0, offset - 1)
-            end = start + limit if limit else len(lines)
-            selected_lines = lines[start:end]
+            end = start + limit if limit else None
+            selected_lines = await asyncio.to_thread(_read_lines_sync, file_path, start, end)
 
             # 添加行号
             output_lines = []
@@ -65,7 +71,7 @@ Use this to examine code, configuration, or any text file."""
             return ToolResult(
                 output="\n".join(output_lines),
                 title=str(file_path),
-                metadata={"total_lines": len(lines)}
+                metadata={"start_line": start + 1, "lines": len(selected_lines)}
             )
 
         except FileNotFoundError:
@@ -2,14 +2,41 @@
 消息格式化模块 - 使用 Panel 美化用户和 AI 消息显示
 """
 
-from datetime import datetime
+import time
 from rich.panel import Panel
+from rich.console import Group
 from rich.markdown import Markdown
 from rich.box import ROUNDED
 from rich.text import Text
 
 from .console import console
 
+# Panel 标题（模块加载时解析一次 markup）
+_USER_TITLE = Text.from_markup("[bold green]👤 You[/bold green]")
+_ASSISTANT_TITLE = Text.from_markup("[bold cyan]🤖 Assistant[/bold cyan]")
+_SYSTEM_TITLE = Text.from_markup("[bold yellow]⚙️  System[/bold yellow]")
+
+# 时间戳缓存：(秒, 格式化结果)，秒级分辨率下流式刷新无需重复 strftime
+_ts_cache: tuple[int, str] = (0, "")
+
+
+def _current_timestamp() -> str:
+    """返回当前时间的格式化字符串（同一秒内复用缓存）"""
+    global _ts_cache
+    now = time.time()
+    now_sec = int(now)
+    if now_sec != _ts_cache[0]:
+        _ts_cache = (now_sec, time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now)))
+    return _ts_cache[1]
+
+
+def _with_timestamp(title: Text) -> Text:
+    """复制标题并追加时间戳"""
+    title = title.copy()
+    title.append(" ")
+    title.append(f"({_current_timestamp()})", style="dim")
+    return title
+
 
 def format_user_message(text: str, show_timestamp: bool = True) -> Panel:
     """
@@ -22,11 +49,7 @@ def format_user_message(text: str, show_timestamp: bool = True) -> Panel:
     Returns:
         Panel 组件
     """
-    now = datetime.now()
-    timestamp = now.strftime("%Y-%m-%d %H:%M:%S")
-    title = "[bold green]👤 You[/bold green]"
-    if show_timestamp:
-        title += f" [dim]({timestamp})[/dim]"
+    title = _with_timestamp(_USER_TITLE) if show_timestamp else _USER_TITLE
     
     return Panel(
         text,
@@ -48,15 +71,16 @@ def format_assistant_message(text: str, streaming: bool = False, show_timestamp:
     Returns:
         Panel 组件
     """
-    now = datetime.now()
-    timestamp = now.strftime("%Y-%m-%d %H:%M:%S")
-    title = "[bold cyan]🤖 Assistant[/bold cyan]"
-    if show_timestamp:
-        title += f" [dim]({timestamp})[/dim]"
+    title = _with_timestamp(_ASSISTANT_TITLE) if show_timestamp else _ASSISTANT_TITLE
     
     # 如果文本为空，显示占位符
     if not text.strip():
         content = Text("[dim]思考中...[/dim]")
+        if streaming:
+            content += Text("▌", style="blink cyan")
+    elif streaming:
+        # 流式输出时不解析 Markdown（结果会被丢弃），直接用纯文本并添加光标
+        content = Text(text) + Text("▌", style="blink cyan")
     else:
         # 尝试解析 Markdown
         try:
@@ -65,14 +89,6 @@ def format_assistant_message(text: str, streaming: bool = False, show_timestamp:
             # 如果 Markdown 解析失败，使用纯文本
             content = text
     
-    # 流式输出时添加光标
-    if streaming:
-        if isinstance(content, Markdown):
-            # Markdown 对象不能直接追加，转换为 Text
-            content = Text(text) + Text("▌", style="blink cyan")
-        else:
-            content = Text(content) + Text("▌", style="blink cyan")
-    
     return Panel(
         content,
         title=title,
@@ -93,7 +109,7 @@ def format_system_message(text: str) -> Panel:
     """
     return Panel(
         Markdown(text) if text.strip() else Text("[dim]系统消息[/dim]"),
-        title="[bold yellow]⚙️  System[/bold yellow]",
+        title=_SYSTEM_TITLE,
         border_style="yellow",
         box=ROUNDED
     )
@@ -101,20 +117,14 @@ def format_system_message(text: str) -> Panel:
 
 def print_user_message(text: str):
     """打印用户消息"""
-    console.print()
-    console.print(format_user_message(text))
-    console.print()
+    console.print(Group("", format_user_message(text), ""))
 
 
 def print_assistant_message(text: str, streaming: bool = False):
     """打印 AI 助手消息"""
-    console.print()
-    console.print(format_assistant_message(text, streaming=streaming))
-    console.print()
+    console.print(Group("", format_assistant_message(text, streaming=streaming), ""))
 
 
 def print_system_message(text: str):
     """打印系统消息"""
-    console.print()
-    console.print(format_system_message(text))
-    console.print()
+    console.print(Group("", format_system_message(text), ""))
@@ -2,6 +2,7 @@
 编辑预览组件 - 流式显示正在写入的代码
 """
 
+import time
 from pathlib import Path
 from rich.live import Live
 from rich.text import Text
@@ -23,33 +24,57 @@ class EditStreamPreview:
     STATE_IN_STRING = "in_string"      # 在 new_string 值内部
     STATE_DONE = "done"                # 完成
     
+    # 要查找的键（逐字符增量匹配）
+    KEY = '"new_string"'
+    
     # 显示配置
     WINDOW_SIZE = 5  # 滑动窗口大小
+    REFRESH_PER_SECOND = 15  # Live 刷新频率，也用于节流显示更新
     
     def __init__(self, file_path: str = "unknown"):
         self.state = self.STATE_SEARCHING
-        self.buffer = ""
+        self.key_pos = 0  # KEY 已匹配的长度
         self.escape_next = False
-        self.line_buffer = ""
+        self.line_buffer: list[str] = []  # 当前行的片段，行结束时再 join
         self.line_count = 0
         self.char_count = 0
         self.header_shown = False
         self.file_path = file_path
         
-        # 滑动窗口：存储最近的行 (line_num, content)
+        # 滑动窗口：存储最近的行 (line_num, 截断并转义后的显示内容)
         self.recent_lines: list[tuple[int, str]] = []
         
         # Live 组件
         self._live = None
         self._live_started = False
+        self._last_update = 0.0
         
     def process_delta(self, delta: str) -> None:
         """处理增量 JSON 字符串片段"""
         if not delta or self.state == self.STATE_DONE:
             return
+        
+        pos = 0
+        end = len(delta)
+        while pos < end and self.state != self.STATE_DONE:
+            if self.state == self.STATE_IN_STRING and not self.escape_next:
+                # 字符串内部：普通字符成段复制，只有引号和反斜杠需要逐字符处理
+                next_quote = delta.find('"', pos)
+                next_escape = delta.find('\\', pos)
+                stop = min(
+                    next_quote if next_quote != -1 else end,
+                    next_escape if next_escape != -1 else end
+                )
+                if stop > pos:
+                    run = delta[pos:stop]
+                    self.line_buffer.append(run)
+                    self.char_count += len(run)
+                    self._update_display()
+                    pos = stop
+                    continue
             
-        for char in delta:
-            self._process_char(char)
+            self._process_char(delta[pos])
+            pos += 1
     
     def _process_char(self, char: str) -> None:
         """处理单个字符"""
@@ -62,25 +87,25 @@ class EditStreamPreview:
                     self.char_count += 1  # 换行也算一个字符
                     self._emit_line()     # 输出当前行
                 elif char == 't':
-                    self.line_buffer += '    '  # Tab 转为 4 空格
+                    self.line_buffer.append('    ')  # Tab 转为 4 空格
                     self.char_count += 1
                 elif char == 'r':
                     pass  # 忽略 \r
                 elif char == '"':
-                    self.line_buffer += '"'
+                    self.line_buffer.append('"')
                     self.char_count += 1
                 elif char == '\\':
-                    self.line_buffer += '\\'
+                    self.line_buffer.append('\\')
                     self.char_count += 1
                 elif char == '/':
-                    self.line_buffer += '/'
+                    self.line_buffer.append('/')
                     self.char_count += 1
                 elif char == 'u':
                     # Unicode 转义，简化处理
-                    self.line_buffer += '\\u'
+                    self.line_buffer.append('\\u')
                     self.char_count += 2
                 else:
-                    self.line_buffer += char
+                    self.line_buffer.append(char)
                     self.char_count += 1
             return
         
@@ -91,13 +116,7 @@ class EditStreamPreview:
         
         # 状态机逻辑
         if self.state == self.STATE_SEARCHING:
-            self.buffer += char
-            # 检测 "new_string": 或 "new_string" :
-            if '"new_string"' in self.buffer:
-                # 继续检查后面是否有冒号
-                if ':' in self.buffer.split('"new_string"')[-1]:
-                    self.state = self.STATE_BEFORE_VALUE
-                    self.buffer = ""
+            self._match_key(char)
                     
         elif self.state == self.STATE_BEFORE_VALUE:
             # 等待值的开始引号
@@ -112,11 +131,29 @@ class EditStreamPreview:
                 self._stop_live()
                 self.state = self.STATE_DONE
             else:
-                self.line_buffer += char
+                self.line_buffer.append(char)
                 self.char_count += 1
                 # 实时更新当前行显示
                 self._update_display()
     
+    def _match_key(self, char: str) -> None:
+        """增量匹配 "new_string": 或 "new_string" :，每个字符 O(1)"""
+        if self.key_pos == len(self.KEY):
+            # 键已匹配，跳过空白等待冒号
+            if char == ':':
+                self.state = self.STATE_BEFORE_VALUE
+                self.key_pos = 0
+                return
+            if char.isspace():
+                return
+            self.key_pos = 0
+        
+        if char == self.KEY[self.key_pos]:
+            self.key_pos += 1
+        else:
+            # KEY 中只有引号既是前缀又是后缀，失配时最多回退到 1
+            self.key_pos = 1 if char == '"' else 0
+    
     def _start_live(self) -> None:
         """启动 Live 显示"""
         if not self._live_started:
@@ -124,7 +161,7 @@ class EditStreamPreview:
             self._live = Live(
                 self._build_display(),
                 console=console,
-                refresh_per_second=15,
+                refresh_per_second=self.REFRESH_PER_SECOND,
                 transient=True  # 结束后清除，然后打印最终结果
             )
             self._live.start()
@@ -151,16 +188,13 @@ class EditStreamPreview:
             lines.append(f"[dim]   │ ... ({self.line_count - self.WINDOW_SIZE} 行已省略) ...[/dim]")
         
         # 显示最近的行
-        for line_num, content in self.recent_lines:
-            line_display = content[:100] + "..." if len(content) > 100 else content
-            line_display = line_display.replace("[", "\\[")
+        for line_num, line_display in self.recent_lines:
             lines.append(f"[dim]   │[/dim] [cyan]{line_num:4}[/cyan] [dim]│[/dim] {line_display}")
         
         # 显示当前正在输入的行（如果有）
         if self.line_buffer:
             current_line_num = self.line_count + 1
-            line_display = self.line_buffer[:100] + "..." if len(self.line_buffer) > 100 else self.line_buffer
-            line_display = line_display.replace("[", "\\[")
+            line_display = self._format_line("".join(self.line_buffer))
             lines.append(f"[dim]   │[/dim] [cyan]{current_line_num:4}[/cyan] [dim]│[/dim] {line_display}[blink]▌[/blink]")
         
         # 底部
@@ -168,36 +202,46 @@ class EditStreamPreview:
         
         return Text.from_markup("\n".join(lines))
     
-    def _update_display(self) -> None:
-        """更新 Live 显示"""
+    @staticmethod
+    def _format_line(content: str) -> str:
+        """截断过长的行并转义 Rich markup"""
+        line_display = content[:100] + "..." if len(content) > 100 else content
+        return line_display.replace("[", "\\[")
+    
+    def _update_display(self, force: bool = False) -> None:
+        """更新 Live 显示（按刷新频率节流，force 时立即更新）"""
         if self._live and self._live_started:
+            now = time.monotonic()
+            if not force and now - self._last_update < 1 / self.REFRESH_PER_SECOND:
+                return
+            self._last_update = now
             self._live.update(self._build_display())
     
     def _emit_line(self) -> None:
         """完成一行，加入滑动窗口"""
         self.line_count += 1
-        line = self.line_buffer
-        self.line_buffer = ""
+        line = "".join(self.line_buffer)
+        self.line_buffer.clear()
         
-        # 加入滑动窗口
-        self.recent_lines.append((self.line_count, line))
+        # 加入滑动窗口（行内容不再变化，只格式化一次）
+        self.recent_lines.append((self.line_count, self._format_line(line)))
         
         # 保持窗口大小
         if len(self.recent_lines) > self.WINDOW_SIZE:
             self.recent_lines.pop(0)
         
-        # 更新显示
-        self._update_display()
+        # 更新显示（行边界总是刷新）
+        self._update_display(force=True)
     
     def _emit_final_line(self) -> None:
         """输出最后一行（如果有内容）"""
         if self.line_buffer:
             self.line_count += 1
-            line = self.line_buffer
-            self.recent_lines.append((self.line_count, line))
+            line = "".join(self.line_buffer)
+            self.recent_lines.append((self.line_count, self._format_line(line)))
             if len(self.recent_lines) > self.WINDOW_SIZE:
                 self.recent_lines.pop(0)
-            self.line_buffer = ""
+            self.line_buffer.clear()
     
     def _print_final_result(self) -> None:
         """打印最终静态结果"""
@@ -211,9 +255,7 @@ class EditStreamPreview:
             lines.append(f"[dim]   │ ... ({self.line_count - self.WINDOW_SIZE} 行已省略) ...[/dim]")
         
         # 显示最近的行
-        for line_num, content in self.recent_lines:
-            line_display = content[:100] + "..." if len(content) > 100 else content
-            line_display = line_display.replace("[", "\\[")
+        for line_num, line_display in self.recent_lines:
             lines.append(f"[dim]   │[/dim] [cyan]{line_num:4}[/cyan] [dim]│[/dim] {line_display}")
         
         # 底部统计
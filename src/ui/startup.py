@@ -2,9 +2,12 @@
 启动界面模块 - ASCII Banner、渐变色、状态栏、加载动画
 """
 
+import asyncio
 from datetime import datetime
-from rich.console import Console
+from typing import Awaitable, TypeVar
+from rich.console import Console, Group
 from rich.text import Text
+from rich.style import Style
 from rich.align import Align
 from rich.panel import Panel
 from rich.table import Table
@@ -14,11 +17,11 @@ from rich.box import MINIMAL, ROUNDED
 
 from .console import console
 
+T = TypeVar("T")
 
-def print_ascii_banner():
-    """打印 Mico ASCII 艺术 Banner"""
-    # 明确区分 C 与 O：C 右侧开口，O 完全闭合
-    art = """
+
+# 明确区分 C 与 O：C 右侧开口，O 完全闭合
+_BANNER_ART = """
     ███╗   ███╗  ██╗   █████╗    █████╗
     ████╗ ████║  ██║  ██╔══╝   ██╔══██╗
     ██╔████╔██║  ██║  ██║      ██║  ██║
@@ -26,18 +29,32 @@ def print_ascii_banner():
     ██║ ╚═╝ ██║  ██║  ╚█████╗  ╚█████╔╝
     ╚═╝     ╚═╝  ╚═╝   ╚════╝   ╚════╝
     """
+
+
+def _build_banner() -> Group:
+    """构建渐变色 Banner（模块加载时构建一次）"""
+    cyan = Style.parse("bold cyan")
+    magenta = Style.parse("bold magenta")
     
-    # 渐变色 ASCII Art（从青色渐变到紫色）
-    lines = art.strip().split('\n')
+    # 渐变色 ASCII Art（从青色渐变到紫色），逐行居中
+    lines = _BANNER_ART.strip().split('\n')
+    rows = []
     for i, line in enumerate(lines):
         if not line.strip():
             continue
         ratio = i / len(lines)
-        if ratio < 0.5:
-            color = "cyan"
-        else:
-            color = "magenta"
-        console.print(Align.center(line), style=f"bold {color}")
+        style = cyan if ratio < 0.5 else magenta
+        rows.append(Align.center(Text(line, style=style), style=style))
+    
+    return Group(*rows)
+
+
+_BANNER = _build_banner()
+
+
+def print_ascii_banner():
+    """打印 Mico ASCII 艺术 Banner"""
+    console.print(_BANNER)
     console.print()
 
 
@@ -52,11 +69,16 @@ def print_gradient_text(text: str, colors: list[str] = None):
     if colors is None:
         colors = ["deep_sky_blue1", "dodger_blue1", "blue", "blue_violet", "medium_purple", "magenta"]
     
+    # 第 i 个字符使用 colors[i * k // n]，同色字符成段追加
+    n = len(text)
+    k = len(colors)
     gradient_text = Text()
-    for i, char in enumerate(text):
-        color_idx = int(i / len(text) * len(colors))
-        color = colors[min(color_idx, len(colors) - 1)]
-        gradient_text.append(char, style=f"bold {color}")
+    start = 0
+    for idx, color in enumerate(colors):
+        end = -(-(idx + 1) * n // k)  # ceil((idx + 1) * n / k)
+        if end > start:
+            gradient_text.append(text[start:end], style=Style.parse(f"bold {color}"))
+        start = end
     
     console.print(Align.center(gradient_text))
     console.print()
@@ -112,42 +134,44 @@ def print_welcome_message(username: str = None):
     console.print()
 
 
-def show_loading_step(description: str, spinner_name: str = "dots", duration: float = 0.3):
+async def show_loading_step(description: str, work: Awaitable[T], spinner_name: str = "dots") -> T:
     """
-    显示加载步骤（使用 console.status）
+    显示加载步骤（使用 console.status），直到实际操作完成
     
     Args:
         description: 步骤描述
+        work: 实际要执行的操作
         spinner_name: Spinner 类型
-        duration: 显示时长（秒）
+        
+    Returns:
+        操作的返回值
     """
-    import time
     with console.status(f"[bold cyan]{description}[/bold cyan]", spinner=spinner_name):
-        time.sleep(duration)
+        return await work
 
 
-def show_progress_steps(steps: list[tuple[str, str]]):
+async def show_progress_steps(steps: list[tuple[str, Awaitable]]) -> list:
     """
-    显示多个加载步骤（使用 Progress）
+    显示多个加载步骤（使用 Progress），每个操作完成时更新对应条目
     
     Args:
-        steps: 步骤列表，每个元素为 (description, spinner_name)
+        steps: 步骤列表，每个元素为 (description, awaitable)
+        
+    Returns:
+        各操作的返回值（与 steps 顺序一致）
     """
     with Progress(
         SpinnerColumn(),
         TextColumn("[bold blue]{task.description}"),
         console=console
     ) as progress:
-        tasks = []
-        for desc, spinner_name in steps:
+        async def run_step(desc: str, work: Awaitable):
             task = progress.add_task(desc, total=None)
-            tasks.append((task, spinner_name))
+            result = await work
+            progress.update(task, total=1, completed=1)
+            return result
         
-        # 模拟进度（实际使用时应该根据真实操作完成情况更新）
-        import time
-        for task, spinner_name in tasks:
-            time.sleep(0.5)  # 模拟操作时间
-            progress.update(task, advance=100)
+        return await asyncio.gather(*(run_step(desc, work) for desc, work in steps))
 
 
 def print_token_stats(tokens: dict, show_bars: bool = True):
@@ -2,8 +2,14 @@
 工具显示美化模块 - 使用 Rich 组件美化工具输出
 """
 
-import re
-from pathlib import Path
+import os
+from collections import defaultdict
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Optional, Union
+from pygments.lexer import Lexer
+from pygments.lexers import get_lexer_by_name
+from pygments.util import ClassNotFound
 from rich.panel import Panel
 from rich.syntax import Syntax
 from rich.tree import Tree
@@ -13,6 +19,118 @@ from rich.box import ROUNDED, SIMPLE
 from .console import console
 
 
+class _CachedSyntax(Syntax):
+    """缓存高亮结果的 Syntax，重复渲染时跳过 Pygments 词法分析"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._highlight_cache = None
+    
+    def highlight(self, code, line_range=None):
+        key = (code, line_range)
+        if self._highlight_cache is None or self._highlight_cache[0] != key:
+            self._highlight_cache = (key, super().highlight(code, line_range))
+        # 渲染过程可能修改返回的 Text，返回副本
+        return self._highlight_cache[1].copy()
+
+
+# 超过任一阈值时不做语法高亮，避免 Pygments 卡住界面
+MAX_HIGHLIGHT_BYTES = 200_000
+MAX_HIGHLIGHT_LINES = 5000
+
+# 超过此行数时关闭自动换行并固定代码宽度，省去逐行按终端宽度测量
+FAST_RENDER_LINES = 500
+FAST_RENDER_CODE_WIDTH = 120
+
+
+def _plain_code(code: str, line_numbers: bool) -> Text:
+    """不经过 Pygments 的纯文本代码（可选行号）"""
+    if not line_numbers:
+        return Text(code)
+    return Text("\n".join(
+        f"{i:4} {line}" for i, line in enumerate(code.splitlines(), start=1)
+    ))
+
+
+@lru_cache(maxsize=64)
+def _get_lexer(name: str) -> Union[Lexer, str]:
+    """按语言名获取（并缓存）Pygments lexer，参数与 Rich 内部一致；未知语言原样返回交给 Rich"""
+    try:
+        return get_lexer_by_name(name, stripnl=False, ensurenl=True, tabsize=4)
+    except ClassNotFound:
+        return name
+
+
+# 只缓存小段代码：每个缓存条目都持有完整源码及其高亮结果（约为源码的数十倍）
+SYNTAX_CACHE_MAX_CHARS = 8_192
+
+
+def _new_syntax(code: str, language: str, line_numbers: bool, fast: bool) -> Syntax:
+    """构建 Syntax 对象；fast 时不换行、固定宽度"""
+    return _CachedSyntax(
+        code,
+        _get_lexer(language),
+        theme="monokai",
+        line_numbers=line_numbers,
+        word_wrap=not fast,
+        code_width=FAST_RENDER_CODE_WIDTH if fast else None,
+        start_line=1
+    )
+
+
+_cached_syntax = lru_cache(maxsize=16)(_new_syntax)
+
+
+def _build_syntax(code: str, language: str, line_numbers: bool, fast: bool = False) -> Syntax:
+    """获取 Syntax 对象，小段代码重复显示时复用缓存"""
+    if len(code) <= SYNTAX_CACHE_MAX_CHARS:
+        return _cached_syntax(code, language, line_numbers, fast)
+    return _new_syntax(code, language, line_numbers, fast)
+
+
+# 扩展名 -> 语言名称
+_LANG_MAP = {
+    ".py": "python",
+    ".js": "javascript",
+    ".ts": "typescript",
+    ".tsx": "tsx",
+    ".jsx": "jsx",
+    ".java": "java",
+    ".cpp": "cpp",
+    ".c": "c",
+    ".h": "c",
+    ".hpp": "cpp",
+    ".cs": "csharp",
+    ".go": "go",
+    ".rs": "rust",
+    ".rb": "ruby",
+    ".php": "php",
+    ".swift": "swift",
+    ".kt": "kotlin",
+    ".scala": "scala",
+    ".sh": "bash",
+    ".bash": "bash",
+    ".zsh": "bash",
+    ".fish": "bash",
+    ".yaml": "yaml",
+    ".yml": "yaml",
+    ".json": "json",
+    ".xml": "xml",
+    ".html": "html",
+    ".css": "css",
+    ".scss": "scss",
+    ".sass": "sass",
+    ".sql": "sql",
+    ".md": "markdown",
+    ".toml": "toml",
+    ".ini": "ini",
+    ".cfg": "ini",
+    ".conf": "ini",
+    ".txt": "text",
+}
+
+
+@lru_cache(maxsize=1024)
 def detect_language(file_path: str) -> str:
     """
     根据文件路径检测编程语言
@@ -23,54 +141,26 @@ def detect_language(file_path: str) -> str:
     Returns:
         语言名称（用于 Syntax 高亮）
     """
-    ext = Path(file_path).suffix.lower()
-    lang_map = {
-        ".py": "python",
-        ".js": "javascript",
-        ".ts": "typescript",
-        ".tsx": "tsx",
-        ".jsx": "jsx",
-        ".java": "java",
-        ".cpp": "cpp",
-        ".c": "c",
-        ".h": "c",
-        ".hpp": "cpp",
-        ".cs": "csharp",
-        ".go": "go",
-        ".rs": "rust",
-        ".rb": "ruby",
-        ".php": "php",
-        ".swift": "swift",
-        ".kt": "kotlin",
-        ".scala": "scala",
-        ".sh": "bash",
-        ".bash": "bash",
-        ".zsh": "bash",
-        ".fish": "bash",
-        ".yaml": "yaml",
-        ".yml": "yaml",
-        ".json": "json",
-        ".xml": "xml",
-        ".html": "html",
-        ".css": "css",
-        ".scss": "scss",
-        ".sass": "sass",
-        ".sql": "sql",
-        ".md": "markdown",
-        ".toml": "toml",
-        ".ini": "ini",
-        ".cfg": "ini",
-        ".conf": "ini",
-        ".txt": "text",
-    }
-    return lang_map.get(ext, "text")
+    ext = os.path.splitext(file_path)[1].lower()
+    return _LANG_MAP.get(ext, "text")
+
+
+# 各格式化函数的逐项模板，循环中只做一次 format / %
+_DIR_FMT = "📁 [blue]{}/[/blue]"
+_FILE_FMT = "📄 [green]{}[/green]"
+_GUTTER_FMT = "  %4d "
+_CONTEXT_FMT = "  %4d  %s\n"
+
+# 空目录共用同一个 Tree（只读展示，调用方不会往里添加节点）
+_EMPTY_DIR_TREE = Tree("[dim]空目录[/dim]", guide_style="dim")
 
 
 def format_code_with_syntax(
     code: str,
     file_path: str = "unknown",
     language: str = None,
-    line_numbers: bool = True
+    line_numbers: bool = True,
+    max_lines: Optional[int] = 2000
 ) -> Panel:
     """
     使用 Syntax 高亮显示代码
@@ -80,14 +170,17 @@ def format_code_with_syntax(
         file_path: 文件路径（用于检测语言和标题）
         language: 编程语言（如果为 None，则从文件路径检测）
         line_numbers: 是否显示行号
+        max_lines: 最多渲染的行数，超出部分不显示（None 表示不限制）
         
     Returns:
         Panel 组件
     """
+    title = f"[bold]📝 {os.path.basename(file_path)}[/bold]"
+    
     if not code.strip():
         return Panel(
             Text("[dim]空文件[/dim]"),
-            title=f"[bold]📝 {Path(file_path).name}[/bold]",
+            title=title,
             border_style="green"
         )
     
@@ -96,25 +189,44 @@ def format_code_with_syntax(
         language = detect_language(file_path)
     
     # 计算行数
-    lines = code.split("\n")
+    lines = code.splitlines()
     line_count = len(lines)
+    subtitle = f"{line_count} 行"
     
-    # 创建 Syntax 对象
-    syntax = Syntax(
-        code,
-        language,
-        theme="monokai",
-        line_numbers=line_numbers,
-        word_wrap=True,
-        start_line=1
-    )
+    # 超长代码：只渲染开头部分，总行数放在副标题
+    if max_lines is not None and line_count > max_lines:
+        lines = lines[:max_lines]
+        code = "\n".join(lines)
+        subtitle += f" · 仅显示前 {max_lines} 行"
+    
+    # 纯文本：不经过 Pygments
+    if language == "text":
+        return Panel(
+            _plain_code(code, line_numbers),
+            title=title,
+            subtitle=f"[dim]{subtitle}[/dim]",
+            border_style="green",
+            box=ROUNDED
+        )
+    
+    # 大文件：跳过语法高亮
+    if len(code) > MAX_HIGHLIGHT_BYTES or len(lines) > MAX_HIGHLIGHT_LINES:
+        return Panel(
+            _plain_code(code, line_numbers),
+            title=title,
+            subtitle=f"[dim]{subtitle} · 文件过大，已关闭语法高亮[/dim]",
+            border_style="green",
+            box=ROUNDED
+        )
+    
+    # 创建 Syntax 对象（带缓存）
+    syntax = _build_syntax(code, language, line_numbers, len(lines) > FAST_RENDER_LINES)
     
     # 创建 Panel
-    subtitle = f"[dim]{line_count} 行[/dim]"
     return Panel(
         syntax,
-        title=f"[bold]📝 {Path(file_path).name}[/bold]",
-        subtitle=subtitle,
+        title=title,
+        subtitle=f"[dim]{subtitle}[/dim]",
         border_style="green",
         box=ROUNDED
     )
@@ -131,82 +243,73 @@ def format_directory_tree(list_output: str, root_path: str = ".") -> Tree:
     Returns:
         Tree 组件
     """
-    lines = list_output.strip().split("\n") if list_output.strip() else []
-    if not lines:
-        return Tree("[dim]空目录[/dim]", guide_style="dim")
-    
-    # 解析路径
-    items = []
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-        
-        # 尝试解析格式：可能是 "file.txt" 或 "dir/" 或完整路径
-        path = Path(line)
-        items.append(path)
-    
+    # 解析路径（统一为规范化的字符串，避免反复构造 Path），一次遍历跳过空行
+    # 尝试解析格式：可能是 "file.txt" 或 "dir/" 或完整路径；
+    # 目录只看原始行的结尾 "/"（normpath 会去掉它），不访问文件系统
+    items = [
+        (os.path.normpath(line), line.endswith("/"))
+        for line in (raw.strip() for raw in list_output.splitlines() if raw and not raw.isspace())
+    ]
     if not items:
-        return Tree("[dim]空目录[/dim]", guide_style="dim")
+        return _EMPTY_DIR_TREE
     
     # 构建树结构
+    root_name = os.path.basename(root_path.rstrip("/")) or root_path
     root = Tree(
-        f"📁 [bold blue]{Path(root_path).name or root_path}/[/bold blue]",
+        f"📁 [bold blue]{root_name}/[/bold blue]",
         guide_style="dim"
     )
     
-    # 按路径排序
-    items.sort(key=lambda p: (str(p).count("/"), str(p)))
+    root_key = os.path.normpath(root_path)
     
-    # 构建节点映射
-    nodes = {Path(root_path): root}
+    def parent_of(path: str) -> str:
+        parent = os.path.dirname(path) or "."
+        return root_key if parent == path else parent
     
-    for item in items:
-        # 确保是相对于 root_path 的路径
-        if not str(item).startswith(str(root_path)) and not item.is_absolute():
-            item = Path(root_path) / item
-        
-        # 获取父目录
-        parent = item.parent
-        if parent == item:  # 根目录
-            parent = Path(root_path)
+    # 一次遍历建立 父目录 -> 子项 映射；祖先链遇到已登记的节点即停止
+    children: dict[str, list[str]] = defaultdict(list)
+    dirs: set[str] = set()
+    seen = {root_key, "."}
+    for item, is_dir in items:
+        # 确保是相对于 root_path 的路径（绝对路径经 join 后保持不变）
+        if not item.startswith(root_path):
+            item = os.path.normpath(os.path.join(root_key, item))
         
-        # 确保父节点存在
-        current = parent
-        path_parts = []
-        while current != Path(root_path) and current != Path("."):
-            path_parts.insert(0, current)
-            current = current.parent
+        if is_dir:
+            dirs.add(item)
         
-        for part in path_parts:
-            if part not in nodes:
-                # 找到父节点
-                part_parent = part.parent
-                if part_parent == part:
-                    part_parent = Path(root_path)
-                
-                if part_parent in nodes:
-                    node = nodes[part_parent].add(
-                        f"📁 [blue]{part.name}/[/blue]"
-                    )
-                    nodes[part] = node
-        
-        # 添加当前项
-        if parent in nodes:
-            if item.is_dir() or str(item).endswith("/"):
-                icon = "📁"
-                style = "blue"
-                name = item.name if item.name else str(item)
+        child = item
+        while child not in seen:
+            seen.add(child)
+            parent = parent_of(child)
+            children[parent].append(child)
+            dirs.add(parent)  # 有子项的一定是目录
+            child = parent
+    
+    # 从根节点深度优先生成 Tree
+    def attach(node: Tree, path: str) -> None:
+        for child in sorted(children.get(path, ())):
+            name = os.path.basename(child) or child
+            if child in dirs:
+                attach(node.add(_DIR_FMT.format(name)), child)
             else:
-                icon = "📄"
-                style = "green"
-                name = item.name
-            
-            nodes[parent].add(f"{icon} [{style}]{name}[/{style}]")
+                node.add(_FILE_FMT.format(name))
+    
+    attach(root, root_key)
+    if root_key != ".":
+        # 相对路径的父目录可能落在 "." 上
+        attach(root, ".")
     
     return root
 
 
+# 图标 -> (分类, 样式)；图标都是单个码位，可用 line[:1] 直接查表
+_ICON_DISPATCH = {
+    "📁": ("dir", "blue"),
+    "📄": ("file", "green"),
+}
+
+
 def format_list_output_simple(list_output: str) -> Tree:
     """
     简化版：直接将 list 输出转换为树（假设是简单的文件列表）
@@ -218,35 +321,29 @@ def format_list_output_simple(list_output: str) -> Tree:
     Returns:
         Tree 组件
     """
-    lines = list_output.strip().split("\n") if list_output.strip() else []
+    lines = [line.strip() for line in list_output.splitlines() if line and not line.isspace()]
     if not lines:
-        return Tree("[dim]空目录[/dim]", guide_style="dim")
+        return _EMPTY_DIR_TREE
     
     root = Tree("📁 [bold blue]当前目录[/bold blue]", guide_style="dim")
     
     # 分离目录和文件
     dirs = []
     files = []
+    buckets = {"dir": dirs, "file": files}
     
     for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-        
-        # list 工具的输出格式是 "📁 name" 或 "📄 name"
-        # 提取图标和名称
-        if line.startswith("📁"):
-            name = line[1:].strip()
-            dirs.append(f"[blue]{name}[/blue]")
-        elif line.startswith("📄"):
-            name = line[1:].strip()
-            files.append(f"[green]{name}[/green]")
-        else:
+        # list 工具的输出格式是 "📁 name" 或 "📄 name"，按首字符查表分派
+        entry = _ICON_DISPATCH.get(line[:1])
+        if entry is not None:
+            kind, style = entry
+            # 直接构造带样式的 Text，跳过 markup 解析
+            buckets[kind].append(Text(line[1:].strip(), style=style))
+        elif line.endswith("/") or line.endswith("\\"):
             # 如果没有图标，根据后缀判断
-            if line.endswith("/") or line.endswith("\\"):
-                dirs.append(f"[blue]{line}[/blue]")
-            else:
-                files.append(f"[green]{line}[/green]")
+            dirs.append(Text(line, style="blue"))
+        else:
+            files.append(Text(line, style="green"))
     
     # 先添加目录，再添加文件
     for item in dirs:
@@ -273,39 +370,57 @@ def format_diff(old_string: str, new_string: str, file_path: str = "unknown") ->
         # 新文件，只显示新内容
         return format_code_with_syntax(new_string, file_path)
     
+    if not new_string:
+        # 内容被整体删除：无需 diff，单遍输出全部 "-" 行
+        parts = []
+        old_lines = old_string.splitlines()
+        for i, line in enumerate(old_lines, start=1):
+            parts.append((_GUTTER_FMT % i, "dim"))
+            parts.append(("-" + line + "\n", "red"))
+        return _diff_panel(parts, 0, len(old_lines), file_path)
+    
     # 计算差异
-    old_lines = old_string.split("\n")
-    new_lines = new_string.split("\n")
+    old_lines = old_string.splitlines()
+    new_lines = new_string.splitlines()
     
-    diff_text = Text()
+    # 先收集 (文本, 样式) 片段，最后一次性追加
+    parts: list[tuple[str, str]] = []
+    
+    # 基于 SequenceMatcher 的行级 diff，只输出真正的增删
+    opcodes = SequenceMatcher(None, old_lines, new_lines, autojunk=False).get_opcodes()
     
-    # 简单的行对行比较（可以后续优化为更智能的 diff）
-    max_lines = max(len(old_lines), len(new_lines))
-    added_count = 0
-    removed_count = 0
+    # 增删行数直接由 opcode 区间求和（replace = delete + insert）
+    removed_count = sum(i2 - i1 for tag, i1, i2, _, _ in opcodes if tag in ("delete", "replace"))
+    added_count = sum(j2 - j1 for tag, _, _, j1, j2 in opcodes if tag in ("insert", "replace"))
     
-    for i in range(max_lines):
-        old_line = old_lines[i] if i < len(old_lines) else None
-        new_line = new_lines[i] if i < len(new_lines) else None
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == "equal":
+            for i in range(i1, i2):
+                # 行号与内容同为 dim，合并为一个片段
+                parts.append((_CONTEXT_FMT % (i + 1, old_lines[i]), "dim"))
+            continue
         
-        if old_line != new_line:
-            if old_line is not None:
-                diff_text.append(f"  {i+1:4} ", style="dim")
-                diff_text.append(f"-{old_line}\n", style="red")
-                removed_count += 1
-            if new_line is not None:
-                diff_text.append(f"  {i+1:4} ", style="dim")
-                diff_text.append(f"+{new_line}\n", style="green")
-                added_count += 1
-        else:
-            if old_line is not None:
-                diff_text.append(f"  {i+1:4} ", style="dim")
-                diff_text.append(f" {old_line}\n", style="dim")
+        if tag in ("delete", "replace"):
+            for i in range(i1, i2):
+                parts.append((_GUTTER_FMT % (i + 1), "dim"))
+                parts.append(("-" + old_lines[i] + "\n", "red"))
+        if tag in ("insert", "replace"):
+            for j in range(j1, j2):
+                parts.append((_GUTTER_FMT % (j + 1), "dim"))
+                parts.append(("+" + new_lines[j] + "\n", "green"))
+    
+    return _diff_panel(parts, added_count, removed_count, file_path)
+
+
+def _diff_panel(parts: list[tuple[str, str]], added_count: int, removed_count: int, file_path: str) -> Panel:
+    """将 diff 片段组装为 Panel"""
+    diff_text = Text()
+    diff_text.append_tokens(parts)
     
     subtitle = f"[dim]+{added_count} -{removed_count}[/dim]"
     return Panel(
         diff_text,
-        title=f"[bold yellow]📝 Edit: {Path(file_path).name}[/bold yellow]",
+        title=f"[bold yellow]📝 Edit: {os.path.basename(file_path)}[/bold yellow]",
         subtitle=subtitle,
         border_style="yellow",
         box=ROUNDED